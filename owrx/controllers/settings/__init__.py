@@ -6,6 +6,7 @@ from owrx.breadcrumb import Breadcrumb, BreadcrumbItem, BreadcrumbMixin
 from owrx.websocket import WebSocketConnection
 from abc import ABCMeta, abstractmethod
 from urllib.parse import parse_qs
+from io import StringIO
 
 import logging
 
@@ -43,19 +44,23 @@ class SettingsFormController(AuthorizationMixin, BreadcrumbMixin, WebpageControl
         return self.errors
 
     def render_sections(self):
-        sections = "".join(section.render(self.getData(), self.getErrors()) for section in self.getSections())
-        buttons = self.render_buttons()
-        return """
+        data = self.getData()
+        errors = self.getErrors()
+        buf = StringIO()
+        buf.write("""
             <form class="settings-body" method="POST">
-                {sections}
+                """)
+        for section in self.getSections():
+            section.render_into(buf, data, errors)
+        buf.write("""
                 <div class="buttons container">
                     {buttons}
                 </div>
             </form>
         """.format(
-            sections=sections,
-            buttons=buttons,
-        )
+            buttons=self.render_buttons(),
+        ))
+        return buf.getvalue()
 
     def render_buttons(self):
         return """
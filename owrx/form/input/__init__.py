@@ -3,63 +3,173 @@ from owrx.modes import Modes
 from owrx.form.input.validator import Validator
 from owrx.form.input.converter import Converter, NullConverter, IntConverter, FloatConverter, EnumConverter, TextConverter
 from enum import Enum
+from functools import lru_cache
+import html
+
+
+# HTML fragments used by the inputs below. these are plain %-style templates so rendering
+# is a single substitution instead of going through the str.format() mini-language every time.
+_WRAPPER_PREFIX_TMPL = """
+            <div class="form-group row" data-field="%(id)s">
+                <label class="col-form-label col-form-label-sm col-3" for="%(id)s">%(label)s</label>
+                <div class="col-9 p-0 removable-group %(removable)s">
+                    <div class="removable-item">
+                        """
+
+_WRAPPER_SUFFIX_TMPL = """
+                        %(infotext)s
+                    </div>
+                    %(removebutton)s
+                </div>
+            </div>
+        """
+
+_INFOTEXT_TMPL = "<small>%(text)s</small>"
+
+_REMOVE_BUTTON = '<button type="button" class="btn btn-sm btn-danger option-remove-button">Remove</button>'
+
+_ERROR_TMPL = """<div class="invalid-feedback">%(msg)s</div>"""
+
+_INPUT_GROUP_TMPL = """
+            %(input)s
+            %(errors)s
+        """
+
+_INPUT_TMPL = "<input %(properties)s />"
+
+_TEXTAREA_TMPL = """
+            <textarea %(properties)s>%(value)s</textarea>
+        """
+
+_NUMBER_INPUT_GROUP_TMPL = """
+            <div class="input-group input-group-sm">
+                %(input)s
+                %(append)s
+                %(errors)s
+            </div>
+        """
+
+_NUMBER_INPUT_APPEND_TMPL = """
+                <div class="input-group-append">
+                    <span class="input-group-text">%(append)s</span>
+                </div>
+            """
+
+_CHECKBOX_INPUT_TMPL = """
+            <div class="%(classes)s">
+                <input type="hidden" name="%(id)s" value="0" %(disabled)s>
+                <input class="form-check-input" type="checkbox" id="%(id)s" name="%(id)s" value="1" %(checked)s %(disabled)s>
+                <label class="form-check-label" for="%(id)s">
+                    %(checkboxText)s
+                </label>
+            </div>
+        """
+
+_MULTI_CHECKBOX_TMPL = """
+          <div class="%(classes)s">
+            <input class="form-check-input" type="checkbox" id="%(id)s" name="%(id)s" %(checked)s %(disabled)s>
+            <label class="form-check-label" for="%(id)s">
+              %(checkboxText)s
+            </label>
+          </div>
+        """
+
+_DROPDOWN_INPUT_TMPL = """
+            <select class="%(classes)s" id="%(id)s" name="%(id)s" %(disabled)s>%(options)s</select>
+        """
+
+_EXPONENTIAL_APPEND_TMPL = """
+            <div class="input-group-append">
+                <select class="input-group-text exponent" name="%(id)s-exponent" tabindex="-1" %(disabled)s>
+                    <option value="0" selected>%(unit)s</option>
+                    <option value="3">k%(unit)s</option>
+                    <option value="6">M%(unit)s</option>
+                    <option value="9">G%(unit)s</option>
+                    <option value="12">T%(unit)s</option>
+                </select>
+            </div>
+        """
+
+_EXPONENTIAL_INPUT_GROUP_TMPL = """
+            <div class="input-group input-group-sm exponential-input">
+                %(input)s
+                %(append)s
+                %(errors)s
+            </div>
+        """
+
+_DROPDOWN_OPTION_TMPL = """
+                <option value="%(value)s" %(selected)s>%(text)s</option>
+            """
+
+
+class _PartialMapping(dict):
+    # leaves unknown placeholders in place so they can be filled in at render time
+    def __missing__(self, key):
+        return "%(" + key + ")s"
+
+
+def prerender(template, **values):
+    """
+    Fills in the invariant placeholders of a template once, returning a smaller template that only contains
+    the placeholders that vary per render.
+    """
+    return template % _PartialMapping({k: str(v).replace("%", "%%") for k, v in values.items()})
 
 
 class Input(ABC):
+    # css classes of the input element, "is-invalid" is added when there are errors
+    _INPUT_CLASSES = "form-control form-control-sm"
+
     def __init__(self, id, label, infotext=None, converter: Converter = None, validator: Validator = None, disabled=False, removable=False):
         self.id = id
         self.label = label
+        # id and label do not change, so they are escaped once. infotext may contain markup and is used verbatim.
+        self._id_esc = html.escape(id)
+        self._label_esc = html.escape(label)
         self.infotext = infotext
         self.converter = self.defaultConverter() if converter is None else converter
         self.validator = validator
         self.disabled = disabled
         self.removable = removable
+        self._infotext_html = _INFOTEXT_TMPL % {"text": self.infotext} if self.infotext else ""
+        self._update_wrapper()
+
+    def _update_wrapper(self):
+        # the decoration around the input only depends on the input's properties, not on the value.
+        self._wrapper_prefix = _WRAPPER_PREFIX_TMPL % {
+            "id": self._id_esc,
+            "label": self._label_esc,
+            "removable": "removable" if self.removable else "",
+        }
+        self._wrapper_suffix = _WRAPPER_SUFFIX_TMPL % {
+            "infotext": self._infotext_html,
+            "removebutton": _REMOVE_BUTTON if self.removable else "",
+        }
 
     def setDisabled(self, disabled=True):
         self.disabled = disabled
 
     def setRemovable(self, removable=True):
         self.removable = removable
+        self._update_wrapper()
 
     def defaultConverter(self):
         return NullConverter()
 
     def bootstrap_decorate(self, input):
-        return """
-            <div class="form-group row" data-field="{id}">
-                <label class="col-form-label col-form-label-sm col-3" for="{id}">{label}</label>
-                <div class="col-9 p-0 removable-group {removable}">
-                    <div class="removable-item">
-                        {input}
-                        {infotext}
-                    </div>
-                    {removebutton}
-                </div>
-            </div>
-        """.format(
-            id=self.id,
-            label=self.label,
-            input=input,
-            infotext="<small>{text}</small>".format(text=self.infotext) if self.infotext else "",
-            removable="removable" if self.removable else "",
-            removebutton='<button type="button" class="btn btn-sm btn-danger option-remove-button">Remove</button>'
-            if self.removable
-            else "",
-        )
+        return self._wrapper_prefix + input + self._wrapper_suffix
 
     def input_classes(self, errors):
-        classes = ["form-control", "form-control-sm"]
-        if errors:
-            classes.append("is-invalid")
-        return " ".join(classes)
+        return self._INPUT_CLASSES + " is-invalid" if errors else self._INPUT_CLASSES
 
     def input_properties(self, value, errors):
         props = {
             "class": self.input_classes(errors),
-            "id": self.id,
-            "name": self.id,
-            "placeholder": self.label,
-            "value": value,
+            "id": self._id_esc,
+            "name": self._id_esc,
+            "placeholder": self._label_esc,
+            "value": html.escape(str(value)),
         }
         if self.disabled:
             props["disabled"] = "disabled"
@@ -69,24 +179,36 @@ class Input(ABC):
         return " ".join('{}="{}"'.format(prop, value) for prop, value in self.input_properties(value, error).items())
 
     def render_errors(self, errors):
-        return "".join("""<div class="invalid-feedback">{msg}</div>""".format(msg=e) for e in errors)
+        return "".join([_ERROR_TMPL % {"msg": html.escape(str(e))} for e in errors])
 
     def render_input_group(self, value, errors):
-        return """
-            {input}
-            {errors}
-        """.format(
-            input=self.render_input(value, errors),
-            errors=self.render_errors(errors)
-        )
+        return _INPUT_GROUP_TMPL % {
+            "input": self.render_input(value, errors),
+            "errors": self.render_errors(errors),
+        }
 
     def render_input(self, value, errors):
-        return "<input {properties} />".format(properties=self.render_input_properties(value, errors))
+        return _INPUT_TMPL % {"properties": self.render_input_properties(value, errors)}
 
-    def render(self, config, errors):
+    def render_config(self, config, errors):
+        """
+        Renders the input group for this input's value in the config, without the decoration around it.
+        """
         value = config[self.id] if self.id in config else None
         error = errors[self.id] if self.id in errors else []
-        return self.bootstrap_decorate(self.render_input_group(self.converter.convert_to_form(value), error))
+        return self.render_input_group(self.converter.convert_to_form(value), error)
+
+    def render(self, config, errors):
+        return self._wrapper_prefix + self.render_config(config, errors) + self._wrapper_suffix
+
+    def render_into(self, buf, config, errors):
+        """
+        Writes the decorated input to the buffer, allowing callers to collect a whole form without joining
+        a string per input.
+        """
+        buf.write(self._wrapper_prefix)
+        buf.write(self.render_config(config, errors))
+        buf.write(self._wrapper_suffix)
 
     def parse(self, data):
         if self.id in data:
@@ -99,6 +221,9 @@ class Input(ABC):
     def getLabel(self):
         return self.label
 
+    def getLabelHtml(self):
+        return self._label_esc
+
 
 class TextInput(Input):
     def input_properties(self, value, errors):
@@ -115,6 +240,7 @@ class NumberInput(Input):
         super().__init__(id, label, infotext, converter=converter, validator=validator)
         self.step = None
         self.append = append
+        self._append_html = _NUMBER_INPUT_APPEND_TMPL % {"append": html.escape(append)} if append else ""
 
     def defaultConverter(self):
         return IntConverter()
@@ -127,28 +253,11 @@ class NumberInput(Input):
         return props
 
     def render_input_group(self, value, errors):
-        if self.append:
-            append = """
-                <div class="input-group-append">
-                    <span class="input-group-text">{append}</span>
-                </div>
-            """.format(
-                append=self.append
-            )
-        else:
-            append = ""
-
-        return """
-            <div class="input-group input-group-sm">
-                {input}
-                {append}
-                {errors}
-            </div>
-        """.format(
-            input=self.render_input(value, errors),
-            append=append,
-            errors=self.render_errors(errors)
-        )
+        return _NUMBER_INPUT_GROUP_TMPL % {
+            "input": self.render_input(value, errors),
+            "append": self._append_html,
+            "errors": self.render_errors(errors),
+        }
 
 
 class FloatInput(NumberInput):
@@ -162,12 +271,10 @@ class FloatInput(NumberInput):
 
 class TextAreaInput(Input):
     def render_input(self, value, errors):
-        return """
-            <textarea {properties}>{value}</textarea>
-        """.format(
-            properties=self.render_input_properties(value, errors),
-            value=value,
-        )
+        return _TEXTAREA_TMPL % {
+            "properties": self.render_input_properties(value, errors),
+            "value": html.escape(str(value)),
+        }
 
     def input_properties(self, value, errors):
         props = super().input_properties(value, errors)
@@ -178,32 +285,20 @@ class TextAreaInput(Input):
 
 
 class CheckboxInput(Input):
+    _INPUT_CLASSES = "form-check form-control-sm"
+
     def __init__(self, id, checkboxText, infotext=None, converter: Converter = None):
         super().__init__(id, "", infotext=infotext, converter=converter)
         self.checkboxText = checkboxText
 
     def render_input(self, value, errors):
-        return """
-            <div class="{classes}">
-                <input type="hidden" name="{id}" value="0" {disabled}>
-                <input class="form-check-input" type="checkbox" id="{id}" name="{id}" value="1" {checked} {disabled}>
-                <label class="form-check-label" for="{id}">
-                    {checkboxText}
-                </label>
-            </div>
-        """.format(
-            id=self.id,
-            classes=self.input_classes(errors),
-            checked="checked" if value else "",
-            disabled="disabled" if self.disabled else "",
-            checkboxText=self.checkboxText,
-        )
-
-    def input_classes(self, error):
-        classes = ["form-check", "form-control-sm"]
-        if error:
-            classes.append("is-invalid")
-        return " ".join(classes)
+        return _CHECKBOX_INPUT_TMPL % {
+            "id": self._id_esc,
+            "classes": self.input_classes(errors),
+            "checked": "checked" if value else "",
+            "disabled": "disabled" if self.disabled else "",
+            "checkboxText": self.checkboxText,
+        }
 
     def parse(self, data):
         if self.id in data:
@@ -213,58 +308,58 @@ class CheckboxInput(Input):
     def getLabel(self):
         return self.checkboxText
 
+    def getLabelHtml(self):
+        # checkboxText may contain markup and is used verbatim, like in render_input()
+        return self.checkboxText
+
 
 class Option(object):
     # used for both MultiCheckboxInput and DropdownInput
+    __slots__ = ("value", "text")
+
     def __init__(self, value, text):
         self.value = value
         self.text = text
 
 
 class MultiCheckboxInput(Input):
+    _INPUT_CLASSES = "form-check form-control-sm"
+
     def __init__(self, id, label, options, infotext=None):
         super().__init__(id, label, infotext=infotext)
         self.options = options
+        self._checkbox_ids = [(o, self.checkbox_id(o)) for o in options]
+        self._checkbox_templates = [
+            (o, prerender(_MULTI_CHECKBOX_TMPL, id=html.escape(boxid), checkboxText=html.escape(o.text)))
+            for o, boxid in self._checkbox_ids
+        ]
 
     def render_input(self, value, errors):
-        return "".join(self.render_checkbox(o, value, errors) for o in self.options)
+        classes = self.input_classes(errors)
+        disabled = "disabled" if self.disabled else ""
+        return "".join(
+            [
+                template % {"classes": classes, "checked": "checked" if o.value in value else "", "disabled": disabled}
+                for o, template in self._checkbox_templates
+            ]
+        )
 
     def checkbox_id(self, option):
         return "{0}-{1}".format(self.id, option.value)
 
-    def render_checkbox(self, option, value, errors):
-        return """
-          <div class="{classes}">
-            <input class="form-check-input" type="checkbox" id="{id}" name="{id}" {checked} {disabled}>
-            <label class="form-check-label" for="{id}">
-              {checkboxText}
-            </label>
-          </div>
-        """.format(
-            id=self.checkbox_id(option),
-            classes=self.input_classes(errors),
-            checked="checked" if option.value in value else "",
-            checkboxText=option.text,
-            disabled="disabled" if self.disabled else "",
-        )
-
     def parse(self, data):
-        def in_response(option):
-            boxid = self.checkbox_id(option)
-            return boxid in data and data[boxid][0] == "on"
+        return {self.id: [o.value for o, boxid in self._checkbox_ids if data.get(boxid, [None])[0] == "on"]}
 
-        return {self.id: [o.value for o in self.options if in_response(o)]}
 
-    def input_classes(self, error):
-        classes = ["form-check", "form-control-sm"]
-        if error:
-            classes.append("is-invalid")
-        return " ".join(classes)
+@lru_cache(maxsize=1)
+def _services_options(services):
+    return [Option(s.modulation, s.name) for s in services]
 
 
 class ServicesCheckboxInput(MultiCheckboxInput):
     def __init__(self, id, label, infotext=None):
-        services = [Option(s.modulation, s.name) for s in Modes.getAvailableServices()]
+        # keyed by the available services, since availability is re-detected when the feature cache expires
+        services = _services_options(tuple(Modes.getAvailableServices()))
         super().__init__(id, label, services, infotext)
 
 
@@ -291,35 +386,33 @@ class DropdownInput(Input):
                 converter = EnumConverter(options)
         else:
             self.options = options
+        # everything but the selected state of an option is fixed, so it is rendered once
+        self._option_templates = tuple(
+            (o.value, prerender(_DROPDOWN_OPTION_TMPL, value=html.escape(str(o.value)), text=html.escape(o.text)))
+            for o in self.options
+        )
         super().__init__(id, label, infotext=infotext, converter=converter)
 
     def render_input(self, value, errors):
-        return """
-            <select class="{classes}" id="{id}" name="{id}" {disabled}>{options}</select>
-        """.format(
-            classes=self.input_classes(errors),
-            id=self.id,
-            options=self.render_options(value),
-            disabled="disabled" if self.disabled else "",
-        )
+        return _DROPDOWN_INPUT_TMPL % {
+            "classes": self.input_classes(errors),
+            "id": self._id_esc,
+            "options": self.render_options(value),
+            "disabled": "disabled" if self.disabled else "",
+        }
 
     def render_options(self, value):
-        options = [
-            """
-                <option value="{value}" {selected}>{text}</option>
-            """.format(
-                text=o.text,
-                value=o.value,
-                selected="selected" if o.value == value else "",
-            )
-            for o in self.options
-        ]
-        return "".join(options)
+        return "".join(
+            [template % {"selected": "selected" if v == value else ""} for v, template in self._option_templates]
+        )
 
 
 class DropdownEnum(Enum):
     def toOption(self):
-        return Option(self.name, str(self))
+        # enum members are immutable, so the option can be shared by all dropdowns using it
+        if "_option" not in self.__dict__:
+            self._option = Option(self.name, str(self))
+        return self._option
 
 
 class ModesInput(DropdownInput):
@@ -343,33 +436,17 @@ class ExponentialInput(Input):
         return props
 
     def render_input_group(self, value, errors):
-        append = """
-            <div class="input-group-append">
-                <select class="input-group-text exponent" name="{id}-exponent" tabindex="-1" {disabled}>
-                    <option value="0" selected>{unit}</option>
-                    <option value="3">k{unit}</option>
-                    <option value="6">M{unit}</option>
-                    <option value="9">G{unit}</option>
-                    <option value="12">T{unit}</option>
-                </select>
-            </div>
-        """.format(
-            id=self.id,
-            disabled="disabled" if self.disabled else "",
-            unit=self.unit,
-        )
+        append = _EXPONENTIAL_APPEND_TMPL % {
+            "id": self._id_esc,
+            "disabled": "disabled" if self.disabled else "",
+            "unit": html.escape(self.unit),
+        }
 
-        return """
-            <div class="input-group input-group-sm exponential-input">
-                {input}
-                {append}
-                {errors}
-            </div>
-        """.format(
-            input=self.render_input(value, errors),
-            append=append,
-            errors=self.render_errors(errors)
-        )
+        return _EXPONENTIAL_INPUT_GROUP_TMPL % {
+            "input": self.render_input(value, errors),
+            "append": append,
+            "errors": self.render_errors(errors),
+        }
 
     def parse(self, data):
         exponent_id = "{}-exponent".format(self.id)
@@ -15,10 +15,11 @@ class AprsBeaconSymbols(DropdownEnum):
         obj = object.__new__(cls)
         obj._value_ = value
         obj.description = description
+        obj._str = "{description} ({symbol})".format(description=description, symbol=value)
         return obj
 
     def __str__(self):
-        return "{description} ({symbol})".format(description=self.description, symbol=self.value)
+        return self._str
 
 
 class AprsAntennaDirections(DropdownEnum):
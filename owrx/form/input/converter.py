@@ -3,6 +3,10 @@ from owrx.jsons import Encoder
 import json
 
 
+# string representations of small integers, which make up most of the integer settings
+_SMALL_INT_STR = [str(i) for i in range(1024)]
+
+
 class Converter(ABC):
     @abstractmethod
     def convert_to_form(self, value):
@@ -61,6 +65,9 @@ class OptionalConverter(Converter):
 
 class IntConverter(Converter):
     def convert_to_form(self, value):
+        # exact type check: bools are ints too, but need to render as "True" / "False"
+        if type(value) is int and 0 <= value < 1024:
+            return _SMALL_INT_STR[value]
         return str(value)
 
     def convert_from_form(self, value):
@@ -78,19 +85,21 @@ class FloatConverter(Converter):
 class EnumConverter(Converter):
     def __init__(self, enumCls):
         self.enumCls = enumCls
+        self._to_form = {m.value: m.name for m in enumCls}
+        self._from_form = {m.name: m.value for m in enumCls}
 
     def convert_to_form(self, value):
         if value is None:
             return None
+        # if the current value is not part of the enum, this will restore the default
         try:
-            return self.enumCls(value).name
-        # if the current value is not part of the enum, this will happen:
-        except ValueError:
-            # and this will restore the default
+            return self._to_form.get(value)
+        # unhashable values cannot be part of the enum either
+        except TypeError:
             return None
 
     def convert_from_form(self, value):
-        return self.enumCls[value].value
+        return self._from_form[value]
 
 
 class JsonConverter(Converter):
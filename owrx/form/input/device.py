@@ -2,6 +2,116 @@ from owrx.form.input import Input, CheckboxInput, DropdownInput, DropdownEnum, T
 from owrx.form.input.converter import OptionalConverter
 from owrx.form.input.validator import RequiredValidator
 from owrx.soapy import SoapySettings
+import html
+
+
+_GAIN_INPUT_TMPL = """
+            <select class="%(classes)s" id="%(id)s-select" name="%(id)s-select" %(disabled)s>
+                %(options)s
+            </select>
+            <div class="option manual" style="display: none;">
+                <input type="number" id="%(id)s-manual" name="%(id)s-manual" value="%(value)s" class="%(classes)s"
+                placeholder="Manual device gain" step="any" %(disabled)s>
+            </div>
+            %(stageoption)s
+        """
+
+_GAIN_INPUT_GROUP_TMPL = """
+            <div id="%(id)s">
+                %(input)s
+                %(errors)s
+            </div>
+        """
+
+_GAIN_STAGES_TMPL = """
+            <div class="option stages container container-fluid" style="display: none;">
+                %(inputs)s
+            </div>
+        """
+
+_GAIN_STAGE_TMPL = """
+                    <div class="row">
+                        <label class="col-form-label col-form-label-sm col-3">%(stage)s</label>
+                        <input type="number" id="%(id)s-%(stage)s" name="%(id)s-%(stage)s" value="%(value)s"
+                        class="col-9 %(classes)s" placeholder="%(stage)s" step="any" %(disabled)s>
+                    </div>
+                """
+
+_OPTION_TMPL = """
+                <option value="%(value)s" %(selected)s>%(text)s</option>
+            """
+
+_SCHEDULER_OFF_OPTION_TMPL = """<option value="None" %(selected)s>Off</option>"""
+
+_SCHEDULER_PROFILES_SELECT_TMPL = """
+            <select class="%(extra_classes)s %(classes)s" id="%(id)s" name="%(id)s" %(disabled)s>
+                %(options)s
+            </select> 
+        """
+
+_SCHEDULER_TIME_INPUT_TMPL = """
+                    <input type="time" class="%(classes)s" id="%(id)s" name="%(id)s" %(disabled)s value="%(value)s">
+                """
+
+_SCHEDULER_STATIC_ROW_TMPL = """
+                <div class="row scheduler-static-time-inputs">
+                    %(time_inputs)s
+                    %(select)s
+                    <button type="button" class="btn btn-sm btn-danger remove-button">X</button>
+                </div>
+            """
+
+_SCHEDULER_STATIC_ENTRIES_TMPL = """
+            %(rows)s
+            <div class="row scheduler-static-time-inputs template" style="display: none;">
+                %(time_inputs)s
+                %(select)s
+                <button type="button" class="btn btn-sm btn-danger remove-button">X</button>
+            </div>
+            <div class="row">
+                <button type="button" class="btn btn-sm btn-primary col-12 add-button">Add...</button>
+            </div>
+        """
+
+_SCHEDULER_DAYLIGHT_ROW_TMPL = """
+                <div class="row">
+                    <label class="col-form-label col-form-label-sm col-3">%(name)s</label>
+                    %(select)s
+                </div>
+            """
+
+_SCHEDULER_INPUT_TMPL = """
+            <div id="%(id)s">
+                <select class="%(classes)s mode" id="%(id)s-select" name="%(id)s-select" %(disabled)s>
+                    %(options)s
+                </select>
+                <div class="option static container container-fluid" style="display: none;">
+                    %(entries)s
+                </div>
+                <div class="option daylight container container-fluid" style="display: None;">
+                    %(stages)s
+                </div>
+            </div>
+        """
+
+_WATERFALL_LEVELS_GROUP_TMPL = """
+            <div class="row %(rowclass)s" id="%(id)s">
+                %(input)s
+            </div>
+            %(errors)s
+        """
+
+_WATERFALL_LEVELS_FIELD_TMPL = """
+                <div class="col row">
+                    <label class="col-3 col-form-label col-form-label-sm" for="%(id)s-%(name)s">%(label)s</label>
+                    <div class="col-9 input-group input-group-sm">
+                        <input type="number" step="any" class="%(classes)s" name="%(id)s-%(name)s" value="%(value)s" %(disabled)s>
+                        <div class="input-group-append">
+                            <span class="input-group-text">%(unit)s</span>
+                        </div>
+                    </div>
+                </div>
+            """
 
 
 class GainInput(Input):
@@ -16,34 +126,21 @@ class GainInput(Input):
         except (ValueError, TypeError):
             display_value = "0.0"
 
-        return """
-            <select class="{classes}" id="{id}-select" name="{id}-select" {disabled}>
-                {options}
-            </select>
-            <div class="option manual" style="display: none;">
-                <input type="number" id="{id}-manual" name="{id}-manual" value="{value}" class="{classes}"
-                placeholder="Manual device gain" step="any" {disabled}>
-            </div>
-            {stageoption}
-        """.format(
-            id=self.id,
-            classes=self.input_classes(errors),
-            value=display_value,
-            label=self.label,
-            options=self.render_options(value),
-            stageoption="" if self.gain_stages is None else self.render_stage_option(value, errors),
-            disabled="disabled" if self.disabled else "",
-        )
+        return _GAIN_INPUT_TMPL % {
+            "id": self._id_esc,
+            "classes": self.input_classes(errors),
+            "value": display_value,
+            "options": self.render_options(value),
+            "stageoption": "" if self.gain_stages is None else self.render_stage_option(value, errors),
+            "disabled": "disabled" if self.disabled else "",
+        }
 
     def render_input_group(self, value, errors):
-        return """
-            <div id="{id}">
-                {input}
-                {errors}
-            </div>
-        """.format(
-            id=self.id, input=self.render_input(value, errors), errors=self.render_errors(errors)
-        )
+        return _GAIN_INPUT_GROUP_TMPL % {
+            "id": self._id_esc,
+            "input": self.render_input(value, errors),
+            "errors": self.render_errors(errors),
+        }
 
     def render_options(self, value):
         options = []
@@ -56,12 +153,10 @@ class GainInput(Input):
         mode = self.getMode(value)
 
         return "".join(
-            """
-                <option value="{value}" {selected}>{text}</option>
-            """.format(
-                value=v[0], text=v[1], selected="selected" if mode == v[0] else ""
-            )
-            for v in options
+            [
+                _OPTION_TMPL % {"value": v[0], "text": v[1], "selected": "selected" if mode == v[0] else ""}
+                for v in options
+            ]
         )
 
     def getMode(self, value):
@@ -85,28 +180,20 @@ class GainInput(Input):
         except (AttributeError, ValueError):
             value_dict = {}
 
-        return """
-            <div class="option stages container container-fluid" style="display: none;">
-                {inputs}
-            </div>
-        """.format(
-            inputs="".join(
-                """
-                    <div class="row">
-                        <label class="col-form-label col-form-label-sm col-3">{stage}</label>
-                        <input type="number" id="{id}-{stage}" name="{id}-{stage}" value="{value}"
-                        class="col-9 {classes}" placeholder="{stage}" step="any" {disabled}>
-                    </div>
-                """.format(
-                    id=self.id,
-                    stage=stage,
-                    value=value_dict[stage] if stage in value_dict else "",
-                    classes=self.input_classes(errors),
-                    disabled="disabled" if self.disabled else "",
-                )
-                for stage in self.gain_stages
+        return _GAIN_STAGES_TMPL % {
+            "inputs": "".join(
+                [
+                    _GAIN_STAGE_TMPL % {
+                        "id": self._id_esc,
+                        "stage": stage,
+                        "value": value_dict[stage] if stage in value_dict else "",
+                        "classes": self.input_classes(errors),
+                        "disabled": "disabled" if self.disabled else "",
+                    }
+                    for stage in self.gain_stages
+                ]
             )
-        )
+        }
 
     def parse(self, data):
         def getStageValue(stage):
@@ -184,10 +271,10 @@ class SchedulerInput(Input):
         super().__init__(id, label)
         self.profiles = {}
 
-    def render(self, config, errors):
+    def render_config(self, config, errors):
         if "profiles" in config:
             self.profiles = config["profiles"]
-        return super().render(config, errors)
+        return super().render_config(config, errors)
 
     def render_profiles_select(self, value, errors, config_key, stage, extra_classes="", allow_empty=False):
         stage_value = ""
@@ -195,47 +282,41 @@ class SchedulerInput(Input):
             stage_value = value["schedule"][config_key]
 
         options = "".join(
-            """
-                <option value="{id}" {selected}>{name}</option>
-            """.format(
-                id=p_id,
-                name=p["name"],
-                selected="selected" if stage_value == p_id else "",
-            )
-            for p_id, p in self.profiles.items()
+            [
+                _OPTION_TMPL % {
+                    "value": p_id,
+                    "text": html.escape(p["name"]),
+                    "selected": "selected" if stage_value == p_id else "",
+                }
+                for p_id, p in self.profiles.items()
+            ]
         )
 
         if allow_empty:
             # prepend a special "off" option to allow a schedule slot to go unused (daylight scheduler)
-            options = """<option value="None" {selected}>Off</option>""".format(
-                selected="selected" if value is None else ""
-            ) + options
+            options = _SCHEDULER_OFF_OPTION_TMPL % {"selected": "selected" if value is None else ""} + options
 
-        return """
-            <select class="{extra_classes} {classes}" id="{id}" name="{id}" {disabled}>
-                {options}
-            </select> 
-        """.format(
-            id="{}-{}".format(self.id, stage),
-            classes=self.input_classes(errors),
-            extra_classes=extra_classes,
-            disabled="disabled" if self.disabled else "",
-            options=options,
-        )
+        return _SCHEDULER_PROFILES_SELECT_TMPL % {
+            "id": "{}-{}".format(self._id_esc, stage),
+            "classes": self.input_classes(errors),
+            "extra_classes": extra_classes,
+            "disabled": "disabled" if self.disabled else "",
+            "options": options,
+        }
 
     def render_static_entires(self, value, errors):
         def render_time_inputs(v):
             values = ["{}:{}".format(x[0:2], x[2:4]) for x in [v[0:4], v[5:9]]]
             return '<div class="p-1">-</div>'.join(
-                """
-                    <input type="time" class="{classes}" id="{id}" name="{id}" {disabled} value="{value}">
-                """.format(
-                    id="{}-{}-{}".format(self.id, "time", "start" if i == 0 else "end"),
-                    classes=self.input_classes(errors),
-                    disabled="disabled" if self.disabled else "",
-                    value=v,
-                )
-                for i, v in enumerate(values)
+                [
+                    _SCHEDULER_TIME_INPUT_TMPL % {
+                        "id": "{}-{}-{}".format(self._id_esc, "time", "start" if i == 0 else "end"),
+                        "classes": self.input_classes(errors),
+                        "disabled": "disabled" if self.disabled else "",
+                        "value": v,
+                    }
+                    for i, v in enumerate(values)
+                ]
             )
 
         schedule = {"0000-0000": ""}
@@ -243,72 +324,43 @@ class SchedulerInput(Input):
             schedule = value["schedule"]
 
         rows = "".join(
-            """
-                <div class="row scheduler-static-time-inputs">
-                    {time_inputs}
-                    {select}
-                    <button type="button" class="btn btn-sm btn-danger remove-button">X</button>
-                </div>
-            """.format(
-                time_inputs=render_time_inputs(slot),
-                select=self.render_profiles_select(value, errors, slot, "profile"),
-            )
-            for slot, entry in schedule.items()
+            [
+                _SCHEDULER_STATIC_ROW_TMPL % {
+                    "time_inputs": render_time_inputs(slot),
+                    "select": self.render_profiles_select(value, errors, slot, "profile"),
+                }
+                for slot, entry in schedule.items()
+            ]
         )
 
-        return """
-            {rows}
-            <div class="row scheduler-static-time-inputs template" style="display: none;">
-                {time_inputs}
-                {select}
-                <button type="button" class="btn btn-sm btn-danger remove-button">X</button>
-            </div>
-            <div class="row">
-                <button type="button" class="btn btn-sm btn-primary col-12 add-button">Add...</button>
-            </div>
-        """.format(
-            rows=rows,
-            time_inputs=render_time_inputs("0000-0000"),
-            select=self.render_profiles_select("", errors, "0000-0000", "profile"),
-        )
+        return _SCHEDULER_STATIC_ENTRIES_TMPL % {
+            "rows": rows,
+            "time_inputs": render_time_inputs("0000-0000"),
+            "select": self.render_profiles_select("", errors, "0000-0000", "profile"),
+        }
 
     def render_daylight_entries(self, value, errors):
         return "".join(
-            """
-                <div class="row">
-                    <label class="col-form-label col-form-label-sm col-3">{name}</label>
-                    {select}
-                </div>
-            """.format(
-                name=name,
-                select=self.render_profiles_select(
-                    value, errors, stage, stage, extra_classes="col-9", allow_empty=True
-                ),
-            )
-            for stage, name in [("day", "Day"), ("night", "Night"), ("greyline", "Greyline")]
+            [
+                _SCHEDULER_DAYLIGHT_ROW_TMPL % {
+                    "name": name,
+                    "select": self.render_profiles_select(
+                        value, errors, stage, stage, extra_classes="col-9", allow_empty=True
+                    ),
+                }
+                for stage, name in [("day", "Day"), ("night", "Night"), ("greyline", "Greyline")]
+            ]
         )
 
     def render_input(self, value, errors):
-        return """
-            <div id="{id}">
-                <select class="{classes} mode" id="{id}-select" name="{id}-select" {disabled}>
-                    {options}
-                </select>
-                <div class="option static container container-fluid" style="display: none;">
-                    {entries}
-                </div>
-                <div class="option daylight container container-fluid" style="display: None;">
-                    {stages}
-                </div>
-            </div>
-        """.format(
-            id=self.id,
-            classes=self.input_classes(errors),
-            disabled="disabled" if self.disabled else "",
-            options=self.render_options(value),
-            entries=self.render_static_entires(value, errors),
-            stages=self.render_daylight_entries(value, errors),
-        )
+        return _SCHEDULER_INPUT_TMPL % {
+            "id": self._id_esc,
+            "classes": self.input_classes(errors),
+            "disabled": "disabled" if self.disabled else "",
+            "options": self.render_options(value),
+            "entries": self.render_static_entires(value, errors),
+            "stages": self.render_daylight_entries(value, errors),
+        }
 
     def _get_mode(self, value):
         if value is not None and "type" in value:
@@ -324,12 +376,10 @@ class SchedulerInput(Input):
         mode = self._get_mode(value)
 
         return "".join(
-            """
-                <option value="{value}" {selected}>{name}</option>
-            """.format(
-                value=value, name=name, selected="selected" if mode == value else ""
-            )
-            for value, name in options
+            [
+                _OPTION_TMPL % {"value": value, "text": name, "selected": "selected" if mode == value else ""}
+                for value, name in options
+            ]
         )
 
     def parse(self, data):
@@ -371,17 +421,12 @@ class WaterfallLevelsInput(Input):
         super().__init__(id, label, infotext=infotext)
 
     def render_input_group(self, value, errors):
-        return """
-            <div class="row {rowclass}" id="{id}">
-                {input}
-            </div>
-            {errors}
-        """.format(
-            rowclass="is-invalid" if errors else "",
-            id=self.id,
-            input=self.render_input(value, errors),
-            errors=self.render_errors(errors),
-        )
+        return _WATERFALL_LEVELS_GROUP_TMPL % {
+            "rowclass": "is-invalid" if errors else "",
+            "id": self._id_esc,
+            "input": self.render_input(value, errors),
+            "errors": self.render_errors(errors),
+        }
 
     def getUnit(self):
         return "dBFS"
@@ -391,26 +436,18 @@ class WaterfallLevelsInput(Input):
 
     def render_input(self, value, errors):
         return "".join(
-            """
-                <div class="col row">
-                    <label class="col-3 col-form-label col-form-label-sm" for="{id}-{name}">{label}</label>
-                    <div class="col-9 input-group input-group-sm">
-                        <input type="number" step="any" class="{classes}" name="{id}-{name}" value="{value}" {disabled}>
-                        <div class="input-group-append">
-                            <span class="input-group-text">{unit}</span>
-                        </div>
-                    </div>
-                </div>
-            """.format(
-                id=self.id,
-                name=name,
-                label=label,
-                value=value[name] if value and name in value else "0",
-                classes=self.input_classes(errors),
-                disabled="disabled" if self.disabled else "",
-                unit=self.getUnit(),
-            )
-            for name, label in self.getFields().items()
+            [
+                _WATERFALL_LEVELS_FIELD_TMPL % {
+                    "id": self._id_esc,
+                    "name": name,
+                    "label": label,
+                    "value": value[name] if value and name in value else "0",
+                    "classes": self.input_classes(errors),
+                    "disabled": "disabled" if self.disabled else "",
+                    "unit": self.getUnit(),
+                }
+                for name, label in self.getFields().items()
+            ]
         )
 
     def parse(self, data):
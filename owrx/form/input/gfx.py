@@ -3,25 +3,28 @@ from owrx.form.input import Input
 from datetime import datetime
 
 
-class ImageInput(Input, metaclass=ABCMeta):
-    def render_input(self, value, errors):
-        # TODO display errors
-        return """
-            <div class="imageupload" data-max-size="{maxsize}">
-                <input type="hidden" id="{id}" name="{id}">
+_IMAGE_INPUT_TMPL = """
+            <div class="imageupload" data-max-size="%(maxsize)s">
+                <input type="hidden" id="%(id)s" name="%(id)s">
                 <div class="image-container">
-                    <img class="{classes}" src="{url}" alt="{label}"/>
+                    <img class="%(classes)s" src="%(url)s" alt="%(label)s"/>
                 </div>
                 <button type="button" class="btn btn-primary upload">Upload new image...</button>
                 <button type="button" class="btn btn-secondary restore">Restore original image</button>
             </div>
-        """.format(
-            id=self.id,
-            label=self.label,
-            url=self.cachebuster(self.getUrl()),
-            classes=" ".join(self.getImgClasses()),
-            maxsize=self.getMaxSize(),
-        )
+        """
+
+
+class ImageInput(Input, metaclass=ABCMeta):
+    def render_input(self, value, errors):
+        # TODO display errors
+        return _IMAGE_INPUT_TMPL % {
+            "id": self._id_esc,
+            "label": self._label_esc,
+            "url": self.cachebuster(self.getUrl()),
+            "classes": " ".join(self.getImgClasses()),
+            "maxsize": self.getMaxSize(),
+        }
 
     def cachebuster(self, url: str):
         return "{url}{separator}cb={cachebuster}".format(
@@ -1,13 +1,62 @@
-from owrx.form.input import Input
+from owrx.form.input import Input, prerender
 from owrx.form.input.validator import Validator
 from owrx.form.error import ValidationError
 from owrx.config import Config
+import threading
+import html
 
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+_LOCATION_INPUTS_TMPL = """
+            <div class="col">
+                <input type="number" class="%(classes)s" id="%(id)s-lat" name="%(id)s-lat" placeholder="%(label)s" value="%(lat)s"
+                step="any" %(disabled)s>
+            </div>
+            <div class="col">
+                <input type="number" class="%(classes)s" id="%(id)s-lon" name="%(id)s-lon" placeholder="%(label)s" value="%(lon)s"
+                step="any" %(disabled)s>
+            </div>
+        """
+
+_LOCATION_INPUT_GROUP_TMPL = """
+            <div class="row %(rowclass)s">
+                %(inputs)s
+            </div>
+            %(errors)s
+            <div class="row">
+                <div class="col map-input" data-key="%(key)s" for="%(id)s"></div>
+            </div>
+        """
+
+
+class GoogleMapsApiKey(object):
+    """
+    Keeps track of the configured Google Maps API key, so that rendering does not need to look it up in the
+    config every time. The key is kept up to date by a subscription on the config.
+    """
+    creationLock = threading.Lock()
+    sharedInstance = None
+
+    @staticmethod
+    def get():
+        # only take the lock while the instance is created, it is never replaced afterwards
+        if GoogleMapsApiKey.sharedInstance is None:
+            with GoogleMapsApiKey.creationLock:
+                if GoogleMapsApiKey.sharedInstance is None:
+                    GoogleMapsApiKey.sharedInstance = GoogleMapsApiKey()
+        return GoogleMapsApiKey.sharedInstance.key
+
+    def __init__(self):
+        self.key = None
+        Config.get().wireProperty("google_maps_api_key", self._setKey)
+
+    def _setKey(self, key):
+        self.key = key
+
+
 class LocationValidator(Validator):
     def validate(self, key, value):
         if "lat" in value and not -90 < value["lat"] < 90:
@@ -22,40 +71,24 @@ class LocationInput(Input):
         if validator is None:
             validator = LocationValidator()
         super().__init__(id, label, validator=validator)
+        self._inputs_template = prerender(_LOCATION_INPUTS_TMPL, id=self._id_esc, label=self._label_esc)
 
     def render_input_group(self, value, errors):
-        return """
-            <div class="row {rowclass}">
-                {inputs}
-            </div>
-            {errors}
-            <div class="row">
-                <div class="col map-input" data-key="{key}" for="{id}"></div>
-            </div>
-        """.format(
-            id=self.id,
-            rowclass="is-invalid" if errors else "",
-            inputs=self.render_input(value, errors),
-            errors=self.render_errors(errors),
-            key=Config.get()["google_maps_api_key"],
-        )
+        return _LOCATION_INPUT_GROUP_TMPL % {
+            "id": self._id_esc,
+            "rowclass": "is-invalid" if errors else "",
+            "inputs": self.render_input(value, errors),
+            "errors": self.render_errors(errors),
+            "key": html.escape(GoogleMapsApiKey.get()),
+        }
 
     def render_input(self, value, errors):
-        return "".join(self.render_sub_input(value, id, errors) for id in ["lat", "lon"])
-
-    def render_sub_input(self, value, id, errors):
-        return """
-            <div class="col">
-                <input type="number" class="{classes}" id="{id}" name="{id}" placeholder="{label}" value="{value}"
-                step="any" {disabled}>
-            </div>
-        """.format(
-            id="{0}-{1}".format(self.id, id),
-            label=self.label,
-            classes=self.input_classes(errors),
-            value=value[id],
-            disabled="disabled" if self.disabled else "",
-        )
+        return self._inputs_template % {
+            "classes": self.input_classes(errors),
+            "lat": value["lat"],
+            "lon": value["lon"],
+            "disabled": "disabled" if self.disabled else "",
+        }
 
     def parse(self, data):
         value = {k: float(data["{0}-{1}".format(self.id, k)][0]) for k in ["lat", "lon"]}
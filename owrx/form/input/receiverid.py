@@ -7,8 +7,8 @@ class ReceiverKeysConverter(Converter):
         return "" if value is None else "\n".join(value)
 
     def convert_from_form(self, value):
-        # \r\n or \n? this should work with both.
-        stripped = [v.strip("\r ") for v in value.split("\n")]
+        # splitlines() handles \r\n, \n and \r alike
+        stripped = [v.strip() for v in value.splitlines()]
         # omit empty lines
         return [v for v in stripped if v]
 
@@ -10,7 +10,8 @@ class WfmTauValues(DropdownEnum):
         obj = object.__new__(cls)
         obj._value_ = value
         obj.description = description
+        obj._str = "{}µs ({})".format(int(value * 1e6), description)
         return obj
 
     def __str__(self):
-        return "{}µs ({})".format(int(self.value * 1e6), self.description)
+        return self._str
@@ -1,65 +1,82 @@
-from owrx.form.input import Input
+from owrx.form.input import Input, prerender
 from owrx.form.input.converter import JsonConverter
 from owrx.wsjt import Q65Mode, Q65Interval
 from owrx.modes import Modes, WsjtMode
 import html
 
 
-class Q65ModeMatrix(Input):
-    def checkbox_id(self, mode, interval):
-        return "{0}-{1}-{2}".format(self.id, mode.value, interval.value)
-
-    def render_checkbox(self, mode: Q65Mode, interval: Q65Interval, value, errors):
-        return """
-            <div class="{classes}">
-                <input class="form-check-input" type="checkbox" id="{id}" name="{id}" {checked} {disabled}>
-                <label class="form-check-label" for="{id}">
-                    {checkboxText}
+_Q65_CHECKBOX_TMPL = """
+            <div class="%(classes)s">
+                <input class="form-check-input" type="checkbox" id="%(id)s" name="%(id)s" %(checked)s %(disabled)s>
+                <label class="form-check-label" for="%(id)s">
+                    %(checkboxText)s
                 </label>
             </div>
-        """.format(
-            classes=self.input_classes(errors),
-            id=self.checkbox_id(mode, interval),
-            checked="checked" if "{}{}".format(mode.name, interval.value) in value else "",
-            checkboxText="Mode {} interval {}s".format(mode.name, interval.value),
-            disabled="" if interval.is_available(mode) and not self.disabled else "disabled",
-        )
+        """
 
-    def render_input_group(self, value, errors):
-        return """
+_Q65_MATRIX_TMPL = """
             <div class="matrix q65-matrix">
-                {checkboxes}
-                {errors}
+                %(checkboxes)s
+                %(errors)s
             </div>
-        """.format(
-            checkboxes=self.render_input(value, errors),
-            errors=self.render_errors(errors),
-        )
+        """
+
+_WSJT_DECODING_DEPTHS_TMPL = """
+            <input type="hidden" class="%(classes)s" id="%(id)s" name="%(id)s" value="%(value)s" %(disabled)s>
+            <div class="inputs" style="display:none;">
+                <select class="form-control form-control-sm">%(options)s</select>
+                <input class="form-control form-control-sm" type="number" step="1">
+            </div>
+        """
+
+_WSJT_MODE_OPTION_TMPL = """
+                <option value=%(mode)s>%(name)s</option>
+            """
+
+
+class Q65ModeMatrix(Input):
+    _INPUT_CLASSES = "form-check form-control-sm"
+
+    def __init__(self, id, label, infotext=None):
+        super().__init__(id, label, infotext=infotext)
+        # (config value, checkbox id, checkbox template, available) for every cell of the matrix
+        self._cells = []
+        for interval in Q65Interval:
+            for mode in Q65Mode:
+                key = "{}{}".format(mode.name, interval.value)
+                boxid = self.checkbox_id(mode, interval)
+                template = prerender(
+                    _Q65_CHECKBOX_TMPL,
+                    id=boxid,
+                    checkboxText="Mode {} interval {}s".format(mode.name, interval.value),
+                )
+                self._cells.append((key, boxid, template, interval.is_available(mode)))
+
+    def checkbox_id(self, mode, interval):
+        return "{0}-{1}-{2}".format(self.id, mode.value, interval.value)
+
+    def render_input_group(self, value, errors):
+        return _Q65_MATRIX_TMPL % {
+            "checkboxes": self.render_input(value, errors),
+            "errors": self.render_errors(errors),
+        }
 
     def render_input(self, value, errors):
+        classes = self.input_classes(errors)
+        selected = set(value)
         return "".join(
-            self.render_checkbox(mode, interval, value, errors) for interval in Q65Interval for mode in Q65Mode
+            [
+                template % {
+                    "classes": classes,
+                    "checked": "checked" if key in selected else "",
+                    "disabled": "" if available and not self.disabled else "disabled",
+                }
+                for key, _, template, available in self._cells
+            ]
         )
 
-    def input_classes(self, error):
-        classes = ["form-check", "form-control-sm"]
-        if error:
-            classes.append("is-invalid")
-        return " ".join(classes)
-
     def parse(self, data):
-        def in_response(mode, interval):
-            boxid = self.checkbox_id(mode, interval)
-            return boxid in data and data[boxid][0] == "on"
-
-        return {
-            self.id: [
-                "{}{}".format(mode.name, interval.value)
-                for interval in Q65Interval
-                for mode in Q65Mode
-                if in_response(mode, interval)
-            ],
-        }
+        return {self.id: [key for key, boxid, _, _ in self._cells if data.get(boxid, [None])[0] == "on"]}
 
 
 class WsjtDecodingDepthsInput(Input):
@@ -68,26 +85,18 @@ class WsjtDecodingDepthsInput(Input):
 
     def render_input(self, value, errors):
         def render_mode(m):
-            return """
-                <option value={mode}>{name}</option>
-            """.format(
-                mode=m.modulation,
-                name=m.name,
-            )
-
-        return """
-            <input type="hidden" class="{classes}" id="{id}" name="{id}" value="{value}" {disabled}>
-            <div class="inputs" style="display:none;">
-                <select class="form-control form-control-sm">{options}</select>
-                <input class="form-control form-control-sm" type="number" step="1">
-            </div>
-        """.format(
-            id=self.id,
-            classes=self.input_classes(errors),
-            value=html.escape(value),
-            options="".join(render_mode(m) for m in Modes.getAvailableModes() if isinstance(m, WsjtMode)),
-            disabled="disabled" if self.disabled else ""
-        )
+            return _WSJT_MODE_OPTION_TMPL % {
+                "mode": m.modulation,
+                "name": m.name,
+            }
+
+        return _WSJT_DECODING_DEPTHS_TMPL % {
+            "id": self._id_esc,
+            "classes": self.input_classes(errors),
+            "value": html.escape(value),
+            "options": "".join(render_mode(m) for m in Modes.getAvailableModes() if isinstance(m, WsjtMode)),
+            "disabled": "disabled" if self.disabled else "",
+        }
 
     def input_classes(self, error):
         return super().input_classes(error) + " wsjt-decoding-depths"
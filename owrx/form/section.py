@@ -1,6 +1,41 @@
 from owrx.form.error import FormError
 from owrx.form.input import Input
 from typing import List
+from io import StringIO
+import html
+
+
+_SECTION_PREFIX_TMPL = """
+            <div class="%(classes)s">
+                <h3 class="settings-header">
+                    %(title)s
+                </h3>
+                """
+
+_SECTION_SUFFIX = """
+            </div>
+        """
+
+_OPTIONAL_SELECT_TMPL = """
+            <hr class="row" />
+            <div class="form-group row">
+                <label class="col-form-label col-form-label-sm col-3">
+                    Additional optional settings
+                </label>
+                <div class="add-group col-9 p-0">
+                    <div class="add-group-select">
+                        <select class="form-control form-control-sm optional-select">
+                            %(options)s
+                        </select>
+                    </div>
+                    <button type="button" class="btn btn-sm btn-success option-add-button">Add</button>
+                </div>
+            </div>
+        """
+
+_OPTIONAL_SELECT_OPTION_TMPL = """
+                    <option value="%(value)s">%(name)s</option>
+                """
 
 
 class Section(object):
@@ -8,26 +43,27 @@ class Section(object):
         self.title = title
         self.inputs = inputs
 
-    def render_input(self, input, data, errors):
-        return input.render(data, errors)
+    def render_inputs_into(self, buf, data, errors):
+        for i in self.inputs:
+            i.render_into(buf, data, errors)
 
     def render_inputs(self, data, errors):
-        return "".join([self.render_input(i, data, errors) for i in self.inputs])
+        buf = StringIO()
+        self.render_inputs_into(buf, data, errors)
+        return buf.getvalue()
 
     def classes(self):
         return ["col-12", "settings-section"]
 
+    def render_into(self, buf, data, errors):
+        buf.write(_SECTION_PREFIX_TMPL % {"classes": " ".join(self.classes()), "title": html.escape(self.title)})
+        self.render_inputs_into(buf, data, errors)
+        buf.write(_SECTION_SUFFIX)
+
     def render(self, data, errors):
-        return """
-            <div class="{classes}">
-                <h3 class="settings-header">
-                    {title}
-                </h3>
-                {inputs}
-            </div>
-        """.format(
-            classes=" ".join(self.classes()), title=self.title, inputs=self.render_inputs(data, errors)
-        )
+        buf = StringIO()
+        self.render_into(buf, data, errors)
+        return buf.getvalue()
 
     def parse(self, data):
         parsed_data = {}
@@ -58,50 +94,31 @@ class OptionalSection(Section):
         return input.id in self.optional
 
     def render_optional_select(self):
-        return """
-            <hr class="row" />
-            <div class="form-group row">
-                <label class="col-form-label col-form-label-sm col-3">
-                    Additional optional settings
-                </label>
-                <div class="add-group col-9 p-0">
-                    <div class="add-group-select">
-                        <select class="form-control form-control-sm optional-select">
-                            {options}
-                        </select>
-                    </div>
-                    <button type="button" class="btn btn-sm btn-success option-add-button">Add</button>
-                </div>
-            </div>
-        """.format(
-            options="".join(
-                """
-                    <option value="{value}">{name}</option>
-                """.format(
-                    value=input.id,
-                    name=input.getLabel(),
-                )
-                for input in self.optional_inputs
+        return _OPTIONAL_SELECT_TMPL % {
+            "options": "".join(
+                [
+                    _OPTIONAL_SELECT_OPTION_TMPL % {"value": input.id, "name": input.getLabelHtml()}
+                    for input in self.optional_inputs
+                ]
             )
-        )
+        }
 
-    def render_optional_inputs(self, data, errors):
-        return """
+    def render_optional_inputs_into(self, buf, data, errors):
+        buf.write("""
             <div class="optional-inputs" style="display: none;">
-                {inputs}
+        """)
+        for i in self.optional_inputs:
+            i.render_into(buf, data, errors)
+        buf.write("""
             </div>
-        """.format(
-            inputs="".join(self.render_input(input, data, errors) for input in self.optional_inputs)
-        )
+        """)
 
-    def render_inputs(self, data, errors):
-        return (
-                super().render_inputs(data, errors)
-                + self.render_optional_select()
-                + self.render_optional_inputs(data, errors)
-        )
+    def render_inputs_into(self, buf, data, errors):
+        super().render_inputs_into(buf, data, errors)
+        buf.write(self.render_optional_select())
+        self.render_optional_inputs_into(buf, data, errors)
 
-    def render(self, data, errors):
+    def render_into(self, buf, data, errors):
         indexed_inputs = {input.id: input for input in self.inputs}
         visible_keys = set(self.mandatory + [k for k in self.optional if k in data or k in errors])
         optional_keys = set(k for k in self.optional if k not in data and k not in errors)
@@ -113,7 +130,7 @@ class OptionalSection(Section):
         for input in self.optional_inputs:
             input.setRemovable()
             input.setDisabled()
-        return super().render(data, errors)
+        super().render_into(buf, data, errors)
 
     def parse(self, data):
         data, errors = super().parse(data)
@@ -0,0 +1,34 @@
+from unittest import TestCase
+from owrx.form.input import TextInput, TextAreaInput, DropdownInput, CheckboxInput, Option
+from owrx.form.section import OptionalSection
+
+
+class InputEscapingTest(TestCase):
+    raw = '<"x"> &'
+    escaped = "&lt;&quot;x&quot;&gt; &amp;"
+
+    def testTextInputEscapesValue(self):
+        result = TextInput("test", "Test").render_input(self.raw, [])
+        self.assertIn('value="{}"'.format(self.escaped), result)
+        self.assertNotIn(self.raw, result)
+
+    def testTextAreaInputEscapesValue(self):
+        result = TextAreaInput("test", "Test").render_input(self.raw, [])
+        self.assertIn(">{}</textarea>".format(self.escaped), result)
+        self.assertNotIn(self.raw, result)
+
+    def testDropdownInputEscapesOptions(self):
+        input = DropdownInput("test", "Test", [Option(self.raw, self.raw)])
+        result = input.render_input(self.raw, [])
+        self.assertIn('value="{}"'.format(self.escaped), result)
+        self.assertIn(">{}</option>".format(self.escaped), result)
+        self.assertIn("selected", result)
+        self.assertNotIn(self.raw, result)
+
+    def testOptionalSelectEscapesLabelsOnly(self):
+        checkboxText = 'Enable <a href="#">this</a>'
+        section = OptionalSection("Test", [TextInput("text", self.raw), CheckboxInput("check", checkboxText)], [], [])
+        section.optional_inputs = section.inputs
+        result = section.render_optional_select()
+        self.assertIn(">{}</option>".format(self.escaped), result)
+        self.assertIn(">{}</option>".format(checkboxText), result)